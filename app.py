@@ -1,11 +1,29 @@
 import streamlit as st
+import atexit
+import dbm
+import glob
+import heapq
+import json
+from collections import deque
+import os
+import queue
+import shelve
+import shutil
 import threading
 import time
-from datetime import datetime, timedelta, timezone
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+import httplib2
+import numpy as np
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from isodate import parse_duration
+
+# pandas, plotly and pyarrow are imported where they are first needed, so a
+# cold start that finds no Shorts (or has no history on disk) never loads them
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --------------------------- Configuration ---------------------------
 
@@ -15,6 +33,17 @@ st.set_page_config(layout="wide")
 # YouTube API Key (set this in Secrets as [youtube] api_key = "YOUR_KEY")
 API_KEY = st.secrets["youtube"]["api_key"]
 
+# India Standard Time: "today" is always the IST calendar day
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Client-side pacing of every API call, shared by discovery and all pollers in this
+# process: at most API_MAX_QPS quota units per second, and at most
+# API_DAILY_UNIT_BUDGET units per quota day (the API's 10k/day quota resets at
+# midnight Pacific Time), keeping a margin below the hard cap
+API_MAX_QPS = 5
+API_DAILY_UNIT_BUDGET = 9500
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
 # Nine channel IDs
 CHANNEL_IDS = [
     "UC415bOPUcGSamy543abLmRA",
@@ -28,259 +57,1206 @@ CHANNEL_IDS = [
     "UCUUlw3anBIkbW9W44Y-eURw",
 ]
 
+# One YouTube client (and keep-alive HTTP connection) per thread
+thread_local = threading.local()
+
+# Network-level failures of an API call (timeouts, resets, DNS), as opposed to an
+# HttpError response from the API itself
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error)
+
+# Streamlit re-executes this file in a fresh namespace on every script run, so a
+# plain module-level Lock would be a different object in each run (and in each
+# poller started from one). Locks shared across runs, sessions and threads come
+# from here instead: one object per name for the life of the process.
+@st.cache_resource(show_spinner=False)
+def process_lock(name: str) -> threading.Lock:
+    """Return the process-wide lock called `name`."""
+    return threading.Lock()
+
+# Guards poll_status ("error_message", "warning_message"): written by the poller,
+# read by the UI. The per-video stats buffers need no lock: the consumer thread is
+# their only writer (see append_stats_row), and discovery logs/metadata are written
+# once before any reader exists. The other process locks: etag_cache_lock (shelve
+# file) and api_quota_lock (quota bucket).
+poll_status_lock = process_lock("poll_status")
+
+# Token bucket behind acquire_api_quota(), one per process (every session's
+# discovery and poller share it): the next free send slot (monotonic clock) and a
+# mirror of the quota day's usage. The usage itself lives in API_QUOTA_PATH and is
+# read-modify-written under api_quota_lock on every acquire, so restarts and other
+# processes add to the same count.
+api_quota_lock = process_lock("api_quota")
+API_QUOTA_PATH = os.path.join("data", "api_quota.json")
+
+@st.cache_resource(show_spinner=False)
+def api_quota_state() -> dict:
+    """Return the process-wide token-bucket state {"next_slot", "day", "used"}."""
+    return {"next_slot": 0.0, "day": None, "used": 0}
+
+api_quota = api_quota_state()
+
+# Per-video stats are kept column-wise (one preallocated NumPy array per column,
+# one row per poll), so each column is contiguous and typed
+STATS_COLUMNS = {
+    "timestamp": np.dtype("datetime64[s]"),
+    "viewCount": np.dtype(np.int64),
+    "likeCount": np.dtype(np.int64),
+    "commentCount": np.dtype(np.int64),
+    "vph": np.dtype(np.float64),
+    "engagement_rate": np.dtype(np.float64),
+}
+STATS_INITIAL_CAPACITY = 48
+# Upper bound on rows kept in memory per video (~2 days at the poll cadence); when
+# full, the oldest half is dropped
+STATS_MAX_ROWS = 96
+
+# Charts show only the most recent rows, so render cost stays flat as the day goes on
+CHART_WINDOW_ROWS = 24
+
+# Bound on the render caches (keyed per video and row count, shared by all sessions):
+# a few live entries for each of a day's Shorts, older ones evicted
+RENDER_CACHE_MAX_ENTRIES = 64
+
+# Seconds per ISO 8601 duration designator (YouTube never uses years/months/weeks)
+DURATION_UNIT_SECS = {"D": 86400, "H": 3600, "M": 60, "S": 1}
+
+# Append-only parquet history, shared across sessions and surviving restarts/redeploys:
+# one day=YYYY-MM-DD directory per IST discovery day, partitioned by video id inside.
+# Days older than STATS_RETENTION_DAYS are deleted, and a day holding more than
+# STATS_COMPACT_MIN_FILES small per-poll files is rewritten as one file per video.
+STATS_DATASET_DIR = os.path.join("data", "shorts")
+STATS_RETENTION_DAYS = 7
+STATS_COMPACT_MIN_FILES = 64
+# Restored history keeps at most one row per video per bucket (pandas offset alias)
+STATS_HISTORY_BUCKET = "min"
+
+# On-disk {cache_key: (etag, response)} for conditional playlistItems requests;
+# shelve is not thread-safe, so discovery workers take the lock around it
+ETAG_CACHE_PATH = os.path.join("data", "etag_cache")
+etag_cache_lock = process_lock("etag_cache")
+
+# Poll cadence by video age: Shorts gain most of their views in the first hours
+POLL_SCHEDULE = [
+    (1 * 3600, 5 * 60),     # first hour: every 5 minutes
+    (4 * 3600, 15 * 60),    # hours 1-4: every 15 minutes
+]
+POLL_INTERVAL_DEFAULT = 60 * 60  # after that: hourly
+# Each consecutive poll with an unchanged viewCount doubles a video's interval,
+# up to 2**STALE_BACKOFF_MAX_EXP times (e.g. hourly -> 2h -> 4h); any change resets it
+STALE_BACKOFF_MAX_EXP = 2
+# Videos past the POLL_SCHEDULE ages whose VPH stayed under a threshold for the last
+# QUIET_WINDOW samples drop to a slower tier (checked in order, first match wins).
+# Each sample spans at least QUIET_SAMPLE_MIN_SECS, so a burst of close polls can't
+# fill the window with near-zero deltas; a quiet video only leaves its tier once
+# later samples (at the tier's own spacing) pick up again.
+QUIET_TIERS = [
+    (10, 24 * 3600),   # < 10 views/hour: once a day
+    (100, 6 * 3600),   # < 100 views/hour: every 6 hours
+]
+QUIET_WINDOW = 3
+QUIET_SAMPLE_MIN_SECS = 3600
+# Most distinct poll batches whose ETags the poller remembers (least recently used
+# dropped first); the due set varies with each video's cadence
+STATS_ETAG_MAX_ENTRIES = 32
+# How long the poller waits before retrying videos whose poll hit a network error
+POLL_RETRY_SECS = 60
+# Minimum spacing between "Poll now" clicks (from any session) that wake a day's poller
+POLL_NOW_COOLDOWN_SECS = 60
+# One poller per IST day runs per process, shared by every session viewing that day;
+# only the newest POLLED_DAYS days keep polling (so sessions opened before midnight
+# still get updates while today's discovery takes over)
+POLLED_DAYS = 2
+
 # ----------------------- Helper Functions ----------------------------
 
+class DiscoveryError(Exception):
+    """
+    Raised by discover_and_initial_stats when an API call failed. Streamlit never
+    caches exceptions, so a failed discovery is not persisted and the next run retries.
+    """
+
+    def __init__(self, logs: list):
+        super().__init__(logs[-1] if logs else "Discovery failed")
+        self.logs = logs
+
+class QuotaBudgetExceeded(Exception):
+    """Raised instead of sending a request once today's API_DAILY_UNIT_BUDGET is spent."""
+
+def acquire_api_quota(cost: int = 1) -> None:
+    """
+    Reserve `cost` quota units before sending an API request, sleeping until the
+    request's send slot if calls are arriving faster than API_MAX_QPS. Slots are
+    reserved under the lock but slept on outside it, so concurrent callers queue up
+    rather than serialize. Raise QuotaBudgetExceeded if the day's budget would be
+    overrun.
+    """
+    with api_quota_lock:
+        api_quota["day"], api_quota["used"] = current_api_quota_usage()
+        if api_quota["used"] + cost > API_DAILY_UNIT_BUDGET:
+            raise QuotaBudgetExceeded(
+                f"Daily API budget of {API_DAILY_UNIT_BUDGET} units is spent "
+                "until midnight Pacific Time."
+            )
+        now = time.monotonic()
+        slot = max(now, api_quota["next_slot"])
+        api_quota["next_slot"] = slot + cost / API_MAX_QPS
+        api_quota["used"] += cost
+        save_api_quota_usage(api_quota["day"], api_quota["used"])
+    if slot > now:
+        time.sleep(slot - now)
+
+def current_api_quota_usage() -> tuple:
+    """
+    Return (today's quota day, units used so far): the saved count if readable,
+    else the in-memory mirror, reset to 0 once the quota day has rolled over.
+    Call with api_quota_lock held.
+    """
+    today = datetime.now(QUOTA_TZ).date().isoformat()
+    day, used = load_api_quota_usage()
+    if day is None:
+        day, used = api_quota["day"], api_quota["used"]
+    return (today, used) if day == today else (today, 0)
+
+def load_api_quota_usage() -> tuple:
+    """Return the (quota day, units used) last saved to API_QUOTA_PATH, or (None, 0)."""
+    try:
+        with open(API_QUOTA_PATH) as f:
+            saved = json.load(f)
+        return saved["day"], int(saved["used"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, 0
+
+def save_api_quota_usage(day: str, used: int) -> None:
+    """Best-effort: atomically replace API_QUOTA_PATH with the day's usage."""
+    tmp_path = f"{API_QUOTA_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(API_QUOTA_PATH), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"day": day, "used": used}, f)
+        os.replace(tmp_path, API_QUOTA_PATH)
+    except OSError:
+        pass
+
+def remaining_api_quota() -> int:
+    """Return how many units of today's API_DAILY_UNIT_BUDGET are left."""
+    with api_quota_lock:
+        _, used = current_api_quota_usage()
+    return API_DAILY_UNIT_BUDGET - used
+
+def seconds_until_quota_reset() -> float:
+    """Return the seconds left until the next midnight in QUOTA_TZ (DST-aware)."""
+    tomorrow = datetime.now(QUOTA_TZ).date() + timedelta(days=1)
+    reset_at = datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=QUOTA_TZ)
+    return max(1.0, (reset_at.astimezone(timezone.utc) - datetime.now(timezone.utc)).total_seconds())
+
 def create_youtube_client():
-    """Each caller gets its own YouTube Data API client."""
-    return build("youtube", "v3", developerKey=API_KEY)
+    """
+    Build a YouTube Data API client backed by its own keep-alive httplib2 connection,
+    so the TLS handshake is paid once per client, not per call. The discovery document
+    ships with google-api-python-client, so building never makes a network request.
+    Use get_thread_youtube_client() rather than calling this directly.
+    """
+    return build(
+        "youtube",
+        "v3",
+        developerKey=API_KEY,
+        http=httplib2.Http(timeout=10),
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+def get_thread_youtube_client():
+    """
+    Return a YouTube client owned by the calling thread, building it on first use.
+    httplib2.Http is not thread-safe, so clients are never shared across threads
+    (UI script thread, discovery workers, stats pollers).
+    """
+    if not hasattr(thread_local, "youtube"):
+        thread_local.youtube = create_youtube_client()
+    return thread_local.youtube
 
 def iso8601_to_seconds(duration_str: str) -> int:
-    """Convert an ISO 8601 duration (e.g., 'PT45S') into total seconds."""
+    """
+    Convert a YouTube ISO 8601 duration (e.g., 'PT1M5S', 'P1DT2H') into total seconds.
+    Scans the digits by hand: no regex and no Duration object per video. Unknown
+    designators are skipped.
+    """
+    total = 0
+    num = 0
+    for c in duration_str[1:]:  # skip "P"
+        if "0" <= c <= "9":
+            num = num * 10 + (ord(c) - 48)
+        else:
+            total += num * DURATION_UNIT_SECS.get(c, 0)
+            num = 0
+    return total
+
+def new_stats_buffer(capacity: int = STATS_INITIAL_CAPACITY) -> dict:
+    """
+    Return an empty per-video stats buffer: {"state": (n, {column: array})}, where n
+    is the number of filled rows. n and the columns live in one tuple so readers can
+    grab both in a single (atomic) lookup.
+    """
+    cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in STATS_COLUMNS.items()}
+    return {"state": (0, cols)}
+
+def stats_snapshot(entry: dict) -> tuple:
+    """Return (n, {column: filled view}) for a stats buffer, without locking."""
+    n, cols = entry["state"]
+    return n, {name: col[:n] for name, col in cols.items()}
+
+def append_stats_row(
+    entry: dict, ts: np.datetime64, views: int, likes: int, comments: int, published: datetime
+) -> None:
+    """
+    Append one stats row, doubling the buffer's capacity when it is full and, past
+    STATS_MAX_ROWS, keeping only the newest half.
+    VPH and engagement rate are derived here, once, instead of on every rerun:
+    - First row: VPH = total_views ÷ hours_since_published
+    - Subsequent rows: VPH = diff in viewCount ÷ hours since the previous row
+    - Engagement rate = (likes + comments) / views
+    Safe for one writer and lock-free readers: rows [0, n) of a published state are
+    never modified (new rows go past n; growing or trimming copies into fresh arrays),
+    and each new (n, cols) is published with a single assignment.
+    """
+    n, cols = entry["state"]
+    if n:
+        hours_since_prev = max((ts - cols["timestamp"][n - 1]) / np.timedelta64(1, "h"), 1e-6)
+        vph = (views - int(cols["viewCount"][n - 1])) / hours_since_prev
+    else:
+        published_ts = np.datetime64(int(published.timestamp()), "s")
+        hours_since_pub = max((ts - published_ts) / np.timedelta64(1, "h"), 1e-6)
+        vph = views / hours_since_pub
+    engagement_rate = (likes + comments) / views if views else 0.0
+
+    capacity = len(cols["timestamp"])
+    if n == capacity:
+        if capacity < STATS_MAX_ROWS:
+            cols = {name: np.resize(col, min(2 * capacity, STATS_MAX_ROWS)) for name, col in cols.items()}
+        else:
+            keep = STATS_MAX_ROWS // 2
+            trimmed = new_stats_buffer(STATS_MAX_ROWS)["state"][1]
+            for name, col in cols.items():
+                trimmed[name][:keep] = col[n - keep:n]
+            cols, n = trimmed, keep
+    row = (ts, views, likes, comments, vph, engagement_rate)
+    for name, value in zip(STATS_COLUMNS, row):
+        cols[name][n] = value
+    entry["state"] = (n + 1, cols)
+
+def stats_day_dir(ist_date_str: str) -> str:
+    """Return the on-disk history directory for one IST discovery day."""
+    return os.path.join(STATS_DATASET_DIR, f"day={ist_date_str}")
+
+def stats_table(vids, timestamps, views, likes, comments):
+    """Build the pyarrow table (one row per poll) that the on-disk history stores."""
+    import pyarrow as pa
+
+    return pa.table({
+        "vid": pa.array(vids, type=pa.string()),
+        "timestamp": pa.array(np.asarray(timestamps, dtype="datetime64[s]")),
+        "viewCount": pa.array(views, type=pa.int64()),
+        "likeCount": pa.array(likes, type=pa.int64()),
+        "commentCount": pa.array(comments, type=pa.int64()),
+    })
+
+def persist_stats_rows(rows: list, ist_date_str: str) -> None:
+    """
+    Append [(video_id, timestamp, viewCount, likeCount, commentCount), ...] to the
+    on-disk history of IST day `ist_date_str`. Best-effort: the in-memory buffers stay
+    authoritative.
+    """
+    if not rows:
+        return
+    import pyarrow.parquet as pq
+
+    table = stats_table(*zip(*rows))
+    try:
+        pq.write_to_dataset(table, root_path=stats_day_dir(ist_date_str), partition_cols=["vid"])
+    except OSError:
+        pass
+
+def prune_persisted_stats(ist_date_str: str) -> None:
+    """
+    Delete every history entry but the last STATS_RETENTION_DAYS days up to
+    `ist_date_str` (this also clears anything not laid out by day).
+    """
+    oldest_kept = (date.fromisoformat(ist_date_str) - timedelta(days=STATS_RETENTION_DAYS - 1)).isoformat()
     try:
-        return int(parse_duration(duration_str).total_seconds())
-    except:
+        names = os.listdir(STATS_DATASET_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not (name.startswith("day=") and name[len("day="):] >= oldest_kept):
+            shutil.rmtree(os.path.join(STATS_DATASET_DIR, name), ignore_errors=True)
+
+def compact_persisted_stats(day_dir: str, df: "pd.DataFrame", old_files: list) -> None:
+    """
+    Rewrite one day's de-duplicated history `df` as a single file per video, then
+    delete the per-poll files it was read from. Files written meanwhile by other
+    sessions are not in `old_files` and are kept. Best-effort.
+    """
+    import pyarrow.parquet as pq
+
+    table = stats_table(
+        df["vid"].to_numpy(),
+        df["timestamp"].to_numpy().astype("datetime64[s]"),
+        df["viewCount"].to_numpy(np.int64),
+        df["likeCount"].to_numpy(np.int64),
+        df["commentCount"].to_numpy(np.int64),
+    )
+    try:
+        pq.write_to_dataset(table, root_path=day_dir, partition_cols=["vid"])
+    except OSError:
+        return
+    for path in old_files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def load_persisted_stats(video_ids, video_to_published: dict, ist_date_str: str) -> dict:
+    """
+    Rebuild {video_id: stats buffer} from IST day `ist_date_str`'s on-disk history for
+    the given videos. Rows of a video less than a STATS_HISTORY_BUCKET apart are
+    collapsed to the latest. Also prunes expired days and compacts the day if it has piled up
+    many small files, so only this one day's files are ever listed.
+    """
+    if not video_ids or not os.path.isdir(STATS_DATASET_DIR):
+        return {}
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    prune_persisted_stats(ist_date_str)
+    day_dir = stats_day_dir(ist_date_str)
+    files = glob.glob(os.path.join(day_dir, "vid=*", "*.parquet"))
+    if not files:
+        return {}
+    try:
+        table = pq.read_table(day_dir)
+    except (OSError, pa.ArrowInvalid):
+        return {}
+
+    # Collapse each video's rows into STATS_HISTORY_BUCKET buckets, keeping the last
+    # poll of each: pollers of other processes (or before a restart) write the same
+    # day, and VPH derived from polls seconds apart would spike
+    df = table.to_pandas().astype({"vid": str}).sort_values("timestamp", kind="stable")
+    df = (
+        df.assign(bucket=df["timestamp"].dt.floor(STATS_HISTORY_BUCKET))
+        .drop_duplicates(["vid", "bucket"], keep="last")
+        .drop(columns="bucket")
+    )
+    if len(files) > STATS_COMPACT_MIN_FILES:
+        compact_persisted_stats(day_dir, df, files)
+    df = df[df["vid"].isin(list(video_ids))]
+    return {
+        vid: stats_buffer_from_columns(
+            group["timestamp"].to_numpy().astype("datetime64[s]"),
+            group["viewCount"].to_numpy(np.int64),
+            group["likeCount"].to_numpy(np.int64),
+            group["commentCount"].to_numpy(np.int64),
+            video_to_published[vid],
+        )
+        for vid, group in df.groupby("vid")
+    }
+
+def poll_interval_secs(age_secs: float, stale_count: int = 0) -> int:
+    """
+    Return how long to wait before polling a video of the given age again, backed off
+    by how many consecutive polls its viewCount has not moved.
+    """
+    backoff = 2 ** min(stale_count, STALE_BACKOFF_MAX_EXP)
+    for max_age, interval in POLL_SCHEDULE:
+        if age_secs < max_age:
+            return interval * backoff
+    return POLL_INTERVAL_DEFAULT * backoff
+
+def stats_buffer_from_columns(
+    ts: np.ndarray, views: np.ndarray, likes: np.ndarray, comments: np.ndarray, published: datetime
+) -> dict:
+    """
+    Build a stats buffer from whole typed columns at once, deriving VPH and
+    engagement rate with vectorized NumPy ops (same rules as append_stats_row).
+    """
+    n = len(ts)
+    if not n:
+        return new_stats_buffer()
+
+    published_ts = np.datetime64(int(published.timestamp()), "s")
+    hours = np.empty(n, dtype=np.float64)
+    hours[0] = (ts[0] - published_ts) / np.timedelta64(1, "h")
+    hours[1:] = np.diff(ts) / np.timedelta64(1, "h")
+    np.maximum(hours, 1e-6, out=hours)
+
+    deltas = np.empty(n, dtype=np.float64)
+    deltas[0] = views[0]
+    deltas[1:] = np.diff(views)
+
+    derived = {
+        "timestamp": ts,
+        "viewCount": views,
+        "likeCount": likes,
+        "commentCount": comments,
+        "vph": deltas / hours,
+        "engagement_rate": np.divide(
+            likes + comments, views, out=np.zeros(n, dtype=np.float64), where=views > 0
+        ),
+    }
+
+    # Keep at most STATS_MAX_ROWS // 2 of the newest rows, as a trim would
+    keep = n if n <= STATS_MAX_ROWS else STATS_MAX_ROWS // 2
+    entry = new_stats_buffer(max(STATS_INITIAL_CAPACITY, keep))
+    cols = entry["state"][1]
+    for name, col in derived.items():
+        cols[name][:keep] = col[n - keep:]
+    entry["state"] = (keep, cols)
+    return entry
+
+def stats_unchanged(entry: dict, views: int, likes: int, comments: int) -> bool:
+    """Return True if the counters equal the buffer's last row (nothing new to append)."""
+    n, cols = entry["state"]
+    if not n:
+        return False
+    return (
+        cols["viewCount"][n - 1] == views
+        and cols["likeCount"][n - 1] == likes
+        and cols["commentCount"][n - 1] == comments
+    )
+
+def quiet_tier_interval(age_secs: float, recent_vph) -> int:
+    """
+    Return the minimum poll interval implied by a video's last QUIET_WINDOW VPH
+    samples (0 if it is not quiet, not enough samples exist yet, or it is still
+    young enough for the POLL_SCHEDULE cadence).
+    """
+    if age_secs < POLL_SCHEDULE[-1][0] or len(recent_vph) < QUIET_WINDOW:
         return 0
+    for max_vph, interval in QUIET_TIERS:
+        if all(vph < max_vph for vph in recent_vph):
+            return interval
+    return 0
+
+def get_today_ist_date_str() -> str:
+    """Return today's date in IST as 'YYYY-MM-DD'."""
+    return datetime.now(timezone.utc).astimezone(IST).date().isoformat()
 
-def get_midnight_ist_utc() -> datetime:
+def get_midnight_ist_utc(ist_date_str: str = None) -> datetime:
     """
-    Return a timezone-aware UTC datetime corresponding to today's midnight in IST.
+    Return a timezone-aware UTC datetime corresponding to midnight in IST of the
+    given IST date ('YYYY-MM-DD', default: today).
     IST = UTC + 5:30 ⇒ 00:00 IST = 18:30 UTC (previous day).
     """
-    now_utc = datetime.now(timezone.utc)
-    now_ist = now_utc.astimezone(timezone(timedelta(hours=5, minutes=30)))
-    today_ist_date = now_ist.date()
+    ist_date = date.fromisoformat(ist_date_str or get_today_ist_date_str())
     midnight_ist = datetime(
-        today_ist_date.year,
-        today_ist_date.month,
-        today_ist_date.day,
+        ist_date.year,
+        ist_date.month,
+        ist_date.day,
         0,
         0,
-        tzinfo=timezone(timedelta(hours=5, minutes=30))
+        tzinfo=IST
     )
     return midnight_ist.astimezone(timezone.utc)
 
-def is_within_today(published_at_str: str) -> bool:
+# Format of the API's publishedAt strings: fixed-width, so they sort lexicographically
+API_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def parse_published_at(published_at_str: str) -> datetime:
+    """
+    Parse a YouTube publishedAt string (always 'YYYY-MM-DDTHH:MM:SSZ') as UTC.
+    The format is fixed-width, so the fields are sliced out directly rather than
+    going through strptime's format matching.
+    """
+    s = published_at_str
+    return datetime(
+        int(s[0:4]), int(s[5:7]), int(s[8:10]),
+        int(s[11:13]), int(s[14:16]), int(s[17:19]),
+        tzinfo=timezone.utc,
+    )
+
+def is_within_today(published_at_str: str, day_start_iso: str, day_end_iso: str) -> bool:
     """
-    Return True if a video's publishedAt (UTC) falls within “today in IST.”
+    Return True if a video's publishedAt (UTC) falls within “today in IST,”
+    given the precomputed [day_start_iso, day_end_iso) bounds in API_TIMESTAMP_FORMAT.
+    publishedAt strings share that fixed-width format, so a plain string comparison
+    is exact and no datetime is parsed per playlist item.
     """
+    return day_start_iso <= published_at_str < day_end_iso
+
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def get_channel_metadata(channel_id: str) -> tuple:
+    """
+    Return (channel_title, uploads_playlist_id). The uploads playlist never changes
+    for a channel, so this is persisted to disk and survives restarts.
+    """
+    acquire_api_quota()
+    ch_resp = get_thread_youtube_client().channels().list(
+        part="snippet,contentDetails",
+        id=channel_id,
+        fields="items(snippet/title,contentDetails/relatedPlaylists/uploads)"
+    ).execute()
+    item = ch_resp["items"][0]
+    return item["snippet"]["title"], item["contentDetails"]["relatedPlaylists"]["uploads"]
+
+def execute_with_etag_cache(request, cache_key: str) -> dict:
+    """
+    Execute a read request conditionally: send the ETag last stored under `cache_key`
+    as If-None-Match and return the stored response on 304 Not Modified. The request's
+    `fields` must include "etag". The cache is best-effort: if it can't be read or
+    written, the request simply runs unconditionally.
+    """
+    cached = None
     try:
-        pub_dt = datetime.fromisoformat(published_at_str.replace("Z", "+00:00")).astimezone(timezone.utc)
-    except:
-        return False
-    midnight_utc = get_midnight_ist_utc()
-    next_midnight_utc = midnight_utc + timedelta(hours=24)
-    return midnight_utc <= pub_dt < next_midnight_utc
+        with etag_cache_lock, shelve.open(ETAG_CACHE_PATH) as cache:
+            cached = cache.get(cache_key)
+    except dbm.error:
+        pass
+    if cached:
+        request.headers["If-None-Match"] = cached[0]
 
-@st.cache_data(ttl=86400)  # cache for 24 hours
-def discover_and_initial_stats():
+    acquire_api_quota()
+    try:
+        resp = request.execute()
+    except HttpError as e:
+        if cached and e.resp.status == 304:
+            return cached[1]
+        raise
+
+    if resp.get("etag"):
+        try:
+            os.makedirs(os.path.dirname(ETAG_CACHE_PATH), exist_ok=True)
+            with etag_cache_lock, shelve.open(ETAG_CACHE_PATH) as cache:
+                cache[cache_key] = (resp["etag"], resp)
+        except dbm.error:
+            pass
+    return resp
+
+def fetch_stats_batches(batches: list, etags: dict) -> list:
     """
-    1. Discover all Shorts (<= 180 s) published “today in IST” across CHANNEL_IDS.
+    Fetch statistics for several batches of up to 50 video IDs in one HTTP round-trip
+    (a BatchHttpRequest with one videos.list sub-request per batch). Each batch's last
+    ETag from `etags` (keyed by ",".join(batch), batch sorted) is sent as If-None-Match.
+    Return one response per batch, None where the server answered 304 Not Modified.
+    Raise the first HttpError of any other failed sub-request, or QuotaBudgetExceeded
+    (before sending anything) if the day's API budget cannot cover the batch.
+    """
+    youtube = get_thread_youtube_client()
+    responses = [None] * len(batches)
+    errors = []
+
+    def on_stats(request_id, response, exception):
+        if exception is None:
+            responses[int(request_id)] = response
+        elif not (isinstance(exception, HttpError) and exception.resp.status == 304):
+            errors.append(exception)
+
+    batch_request = youtube.new_batch_http_request(callback=on_stats)
+    for i, video_ids in enumerate(batches):
+        request = youtube.videos().list(
+            part="statistics",
+            id=",".join(video_ids),
+            fields="etag,items(id,statistics(viewCount,likeCount,commentCount))"
+        )
+        etag = etags.get(",".join(video_ids))
+        if etag:
+            request.headers["If-None-Match"] = etag
+        batch_request.add(request, request_id=str(i))
+    if batches:
+        acquire_api_quota(len(batches))  # one unit per sub-request
+        batch_request.execute()
+
+    if errors:
+        raise errors[0]
+    return responses
+
+def discover_channel(idx: int, channel_id: str, day_start_iso: str, day_end_iso: str):
+    """
+    Discover today's Shorts (<= 180 s) for a single channel.
+    The duration check and the initial stats fetch share one videos.list call.
+    Return (channel_title, channel_shorts, video_to_published, initial_rows, logs, error),
+    where initial_rows is [(video_id, timestamp, viewCount, likeCount, commentCount), ...]
+    and error is True if an API call failed and discovery should stop.
+    """
+    youtube = get_thread_youtube_client()
+    video_to_published = {}
+    initial_rows = []
+    logs = []
+
+    # 1) Channel title & uploads playlist (cached on disk after the first lookup)
+    try:
+        channel_title, uploads_playlist = get_channel_metadata(channel_id)
+    except (HttpError, QuotaBudgetExceeded, *TRANSPORT_ERRORS) as e:
+        logs.append(f"API Error (channel fetch for {channel_id}): {e}")
+        return channel_id, [], {}, [], logs, True
+    logs.append(f"Checking channel {idx}/{len(CHANNEL_IDS)}: {channel_title}")
+
+    # 2) Page through uploads playlist, collecting today's candidates
+    candidate_ids = []
+    page_token = None
+    while True:
+        try:
+            pl_resp = execute_with_etag_cache(
+                youtube.playlistItems().list(
+                    part="snippet",
+                    playlistId=uploads_playlist,
+                    maxResults=50,
+                    pageToken=page_token,
+                    fields="etag,items(snippet(resourceId/videoId,publishedAt)),nextPageToken"
+                ),
+                f"playlistItems:{uploads_playlist}:{page_token or ''}",
+            )
+        except (HttpError, QuotaBudgetExceeded, *TRANSPORT_ERRORS) as e:
+            logs.append(f"API Error (playlistItems for {channel_title}): {e}")
+            return channel_title, [], {}, [], logs, True
+
+        candidate_ids.extend(
+            item["snippet"]["resourceId"]["videoId"]
+            for item in pl_resp["items"]
+            if is_within_today(item["snippet"]["publishedAt"], day_start_iso, day_end_iso)
+        )
+
+        # Uploads come back newest-first: once this page reaches past today's
+        # IST midnight, older pages cannot hold any of today's Shorts.
+        oldest_on_page = min(
+            (item["snippet"]["publishedAt"] for item in pl_resp["items"]),
+            default=None,
+        )
+        if oldest_on_page is not None and oldest_on_page < day_start_iso:
+            break
+
+        page_token = pl_resp.get("nextPageToken")
+        if not page_token:
+            break
+
+    # 3) Fetch duration, publish time and initial stats for up to 50 candidates per call,
+    #    batching across page boundaries
+    channel_shorts = []
+    for i in range(0, len(candidate_ids), 50):
+        batch = candidate_ids[i:i+50]
+        try:
+            acquire_api_quota()
+            cd_resp = youtube.videos().list(
+                part="contentDetails,snippet,statistics",
+                id=",".join(batch),
+                fields="items(id,contentDetails/duration,snippet/publishedAt,"
+                       "statistics(viewCount,likeCount,commentCount))"
+            ).execute()
+        except (HttpError, QuotaBudgetExceeded, *TRANSPORT_ERRORS) as e:
+            logs.append(f"API Error (video details for {channel_title}): {e}")
+            return channel_title, [], {}, [], logs, True
+
+        now_ts = np.datetime64(int(time.time()), "s")
+        for vid_item in cd_resp["items"]:
+            vid_id = vid_item["id"]
+            duration_secs = iso8601_to_seconds(vid_item["contentDetails"]["duration"])
+            if duration_secs <= 180:
+                video_to_published[vid_id] = parse_published_at(vid_item["snippet"]["publishedAt"])
+                channel_shorts.append(vid_id)
+                stats = vid_item["statistics"]
+                initial_rows.append((
+                    vid_id,
+                    now_ts,
+                    int(stats.get("viewCount", 0)),
+                    int(stats.get("likeCount", 0)),
+                    int(stats.get("commentCount", 0)),
+                ))
+
+    if channel_shorts:
+        logs.append(f"Channel {idx}: Found {len(channel_shorts)} Shorts in '{channel_title}'")
+    else:
+        logs.append(f"Channel {idx}: No Shorts found today in '{channel_title}'")
+
+    return channel_title, channel_shorts, video_to_published, initial_rows, logs, False
+
+# Persisted to disk and keyed by IST date: a restart reuses the day's discovery,
+# and the next day's key misses cleanly (Streamlit ignores ttl on persisted caches).
+# Failures raise DiscoveryError instead of returning, so only real results are kept.
+@st.cache_data(persist="disk", max_entries=7, show_spinner=False)
+def discover_and_initial_stats(ist_date_str: str):
+    """
+    1. Discover all Shorts (<= 180 s) published on `ist_date_str` (“today in IST”)
+       across CHANNEL_IDS, running the per-channel discovery concurrently (it is
+       network-bound).
     2. Return:
-       - shorts_data: {video_id: [ (timestamp, viewCount, likeCount, commentCount), ... ]}
+       - shorts_data: {video_id: {"state": (rows used, {column: array})}} (see STATS_COLUMNS)
        - video_to_channel: {video_id: channel_title}
        - video_to_published: {video_id: published_datetime_UTC}
        - discovery_logs: [string, …]
+       - no_shorts_flag: True if no Shorts were published on that day
     The initial stats fetch runs once here (cached), so it won't repeat on every rerun.
+    Raise DiscoveryError (with the logs so far) if any channel's API calls failed.
     """
     shorts_data = {}
     video_to_channel = {}
     video_to_published = {}
     logs = []
-    no_shorts = False
-
-    youtube = create_youtube_client()
+    initial_rows = []
     today_shorts = []
 
-    for idx, channel_id in enumerate(CHANNEL_IDS, start=1):
-        # 1) Fetch channel title & uploads playlist
-        try:
-            ch_resp = youtube.channels().list(
-                part="snippet,contentDetails",
-                id=channel_id
-            ).execute()
-        except HttpError as e:
-            logs.append(f"API Error (channel fetch for {channel_id}): {e}")
-            return {}, {}, {}, logs, True  # treat as "no_shorts" to stop UI
-        
-        channel_title = ch_resp["items"][0]["snippet"]["title"]
-        uploads_playlist = ch_resp["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-        logs.append(f"Checking channel {idx}/{len(CHANNEL_IDS)}: {channel_title}")
-
-        # 2) Page through uploads playlist
-        pl_req = youtube.playlistItems().list(
-            part="snippet",
-            playlistId=uploads_playlist,
-            maxResults=50
-        )
-        channel_shorts = []
-        while pl_req:
-            try:
-                pl_resp = pl_req.execute()
-            except HttpError as e:
-                logs.append(f"API Error (playlistItems for {channel_title}): {e}")
-                return {}, {}, {}, logs, True
+    # Compute today's IST window once per discovery pass
+    midnight_utc = get_midnight_ist_utc(ist_date_str)
+    day_start_iso = midnight_utc.strftime(API_TIMESTAMP_FORMAT)
+    day_end_iso = (midnight_utc + timedelta(hours=24)).strftime(API_TIMESTAMP_FORMAT)
 
-            for item in pl_resp["items"]:
-                vid_id = item["snippet"]["resourceId"]["videoId"]
-                published_at = item["snippet"]["publishedAt"]
-                if not is_within_today(published_at):
-                    continue
+    with ThreadPoolExecutor(max_workers=len(CHANNEL_IDS)) as executor:
+        results = list(executor.map(
+            lambda args: discover_channel(*args, day_start_iso, day_end_iso),
+            enumerate(CHANNEL_IDS, start=1),
+        ))
 
-                # 3) For each candidate, fetch duration + snippet data
-                try:
-                    cd_resp = youtube.videos().list(
-                        part="contentDetails,snippet",
-                        id=vid_id
-                    ).execute()
-                except HttpError as e:
-                    logs.append(f"API Error (video contentDetails for {vid_id}): {e}")
-                    return {}, {}, {}, logs, True
-
-                duration_secs = iso8601_to_seconds(cd_resp["items"][0]["contentDetails"]["duration"])
-                if duration_secs <= 180:
-                    pub_iso = cd_resp["items"][0]["snippet"]["publishedAt"]
-                    pub_dt = datetime.fromisoformat(pub_iso.replace("Z", "+00:00")).astimezone(timezone.utc)
-                    video_to_channel[vid_id] = channel_title
-                    video_to_published[vid_id] = pub_dt
-                    channel_shorts.append(vid_id)
-
-            pl_req = youtube.playlistItems().list_next(pl_req, pl_resp)
-
-        if channel_shorts:
-            logs.append(f"Channel {idx}: Found {len(channel_shorts)} Shorts in '{channel_title}'")
-            today_shorts.extend(channel_shorts)
-        else:
-            logs.append(f"Channel {idx}: No Shorts found today in '{channel_title}'")
+    # Merge in channel order so the logs read the same as a serial run
+    for channel_title, channel_shorts, published_part, rows_part, channel_logs, error in results:
+        logs.extend(channel_logs)
+        if error:
+            raise DiscoveryError(logs)
+        for vid_id in channel_shorts:
+            video_to_channel[vid_id] = channel_title
+        video_to_published.update(published_part)
+        initial_rows.extend(rows_part)
+        today_shorts.extend(channel_shorts)
 
     if not today_shorts:
         logs.append("No Shorts published today in IST across all channels.")
         return {}, {}, {}, logs, True
 
-    # 4) Initialize shorts_data and do an initial stats fetch (cached)
+    # 4) Initialize shorts_data with the stats fetched alongside the durations (cached)
     for vid in today_shorts:
-        shorts_data[vid] = []
+        shorts_data[vid] = new_stats_buffer()
+    for vid, ts, views, likes, comments in initial_rows:
+        append_stats_row(shorts_data[vid], ts, views, likes, comments, video_to_published[vid])
 
-    now_ts = datetime.now(timezone.utc).isoformat()
-    for i in range(0, len(today_shorts), 50):
-        batch = today_shorts[i:i+50]
-        try:
-            stats_resp = youtube.videos().list(
-                part="statistics",
-                id=",".join(batch)
-            ).execute()
-        except HttpError as e:
-            logs.append(f"API Error (initial stats fetch): {e}")
-            return {}, {}, {}, logs, True
-
-        for vid_item in stats_resp["items"]:
-            vid = vid_item["id"]
-            stats = vid_item["statistics"]
-            row = (
-                now_ts,
-                int(stats.get("viewCount", 0)),
-                int(stats.get("likeCount", 0)),
-                int(stats.get("commentCount", 0)),
-            )
-            shorts_data[vid].append(row)
+    persist_stats_rows(initial_rows, ist_date_str)
 
     return shorts_data, video_to_channel, video_to_published, logs, False
 
-def poll_stats_background():
+def poll_stats_background(
+    shorts_data: dict,
+    video_ids: tuple,
+    video_to_published: dict,
+    poll_status: dict,
+    poll_wakeup: threading.Event,
+    poll_stop: threading.Event,
+    ist_date_str: str,
+):
     """
-    Background thread: once discovery+initial fetch is done, this runs every hour
-    to append new (timestamp, viewCount, likeCount, commentCount) per video.
+    Background thread: polls each video on an age-based cadence (see POLL_SCHEDULE),
+    batching whatever is due into videos.list calls. Raw responses go to
+    consume_stats_responses, which appends a (timestamp, viewCount, likeCount,
+    commentCount) row per video to `shorts_data` and to IST day `ist_date_str`'s
+    on-disk history.
+    Everything is passed in explicitly (the thread is started only once discovery has
+    filled them), since st.session_state is not usable off the script thread. Errors
+    are reported through poll_status["error_message"] (fatal) and
+    poll_status["warning_message"] (transient, cleared by the next successful poll).
+    Setting poll_wakeup makes every video due immediately; setting poll_stop (then
+    poll_wakeup, to end the wait) makes the thread return.
     """
-    global error_message
+    # Poll each video on its own age-based cadence: a min-heap of (next_poll_at, video_id)
+    # on the monotonic clock, starting with every video due now. Deadlines are absolute
+    # (each one is the previous deadline + interval), so late wake-ups don't accumulate.
+    start = time.monotonic()
+    schedule = [(start, vid) for vid in video_ids]
+    heapq.heapify(schedule)
+    etags = {}  # ",".join(sorted batch) -> ETag of its last full response, LRU order
+    last_views = {}  # video_id -> viewCount at its last poll
+    vph_anchors = {}  # video_id -> (wall time, viewCount) its next VPH sample starts from
+    recent_vph = {vid: deque(maxlen=QUIET_WINDOW) for vid in video_ids}
+    stale_counts = {}  # video_id -> consecutive polls with an unchanged viewCount
+    forced = False  # True for a cycle triggered by poll_wakeup rather than the schedule
 
-    # First, wait until we have run discovery (cached)
-    while True:
-        # If discovery had an error, bail
-        if error_message:
-            return
-
-        # If the cached discovery returned no_shorts_flag=True, also bail
-        if "no_shorts_flag" in st.session_state and st.session_state.no_shorts_flag:
-            return
+    # Acquisition (this thread) is decoupled from parsing/appending (consumer thread)
+    raw_q = queue.Queue(maxsize=32)
+    threading.Thread(
+        target=consume_stats_responses,
+        args=(raw_q, shorts_data, video_to_published, ist_date_str),
+        daemon=True,
+    ).start()
 
-        # If discovery_keys exist in session_state, break out
-        if "shorts_data" in st.session_state:
-            break
-
-        time.sleep(1)
+    try:
+        while schedule:
+            # If an error occurred, stop
+            if poll_status["error_message"]:
+                return
 
-    # Poll hourly
-    while True:
-        # If an error occurred, stop
-        if st.session_state.error_message:
-            return
+            now = time.monotonic()
+            wall_now = time.time()
+            now_ts = np.datetime64(int(wall_now), "s")
 
-        youtube = create_youtube_client()
-        now_ts = datetime.now(timezone.utc).isoformat()
+            due = []
+            while schedule and schedule[0][0] <= now:
+                due.append(heapq.heappop(schedule))
+            # Sorted, so the same due set always splits into the same batches and
+            # their ETag keys repeat across cycles
+            due_ids = sorted(vid for _, vid in due)
 
-        vids = list(st.session_state.shorts_data.keys())
-        for i in range(0, len(vids), 50):
-            batch = vids[i:i+50]
+            # Send all due batches in one batched HTTP request: one round-trip per cycle
+            batches = [due_ids[i:i+50] for i in range(0, len(due_ids), 50)]
             try:
-                stats_resp = youtube.videos().list(
-                    part="statistics",
-                    id=",".join(batch)
-                ).execute()
+                responses = fetch_stats_batches(batches, etags)
             except HttpError as e:
-                st.session_state.error_message = f"API Error (polling): {e}"
+                with poll_status_lock:
+                    poll_status["error_message"] = f"API Error (polling): {e}"
+                return
+            except (QuotaBudgetExceeded, *TRANSPORT_ERRORS) as e:
+                # Transient: retry the same videos later instead of ending the thread;
+                # once the budget is spent, nothing is sent until it resets
+                if isinstance(e, QuotaBudgetExceeded):
+                    retry_in = seconds_until_quota_reset()
+                    warning = f"{e} Polling pauses until then; the charts show what was collected so far."
+                else:
+                    retry_in = POLL_RETRY_SECS
+                    warning = f"Network error (polling), retrying: {e}"
+                with poll_status_lock:
+                    poll_status["warning_message"] = warning
+                for _, vid in due:
+                    heapq.heappush(schedule, (now + retry_in, vid))
+                # Nothing was polled this cycle: skip straight to the wait below
+                due, due_ids, batches, responses = [], [], [], []
+            else:
+                if batches:
+                    with poll_status_lock:
+                        poll_status["warning_message"] = None
+
+            # Track each video's views since its last poll (a 304 batch moved none of them),
+            # then hand the raw responses to the consumer thread; parsing and appending
+            # never delay the next acquisition
+            polled_views = {}
+            for batch, stats_resp in zip(batches, responses):
+                etag_key = ",".join(batch)
+                if stats_resp is None:
+                    if etag_key in etags:
+                        etags[etag_key] = etags.pop(etag_key)  # still current: mark recently used
+                    for vid in batch:
+                        if vid in last_views:
+                            polled_views[vid] = last_views[vid]
+                    continue
+                etags.pop(etag_key, None)
+                etags[etag_key] = stats_resp.get("etag")
+                if len(etags) > STATS_ETAG_MAX_ENTRIES:
+                    del etags[next(iter(etags))]  # least recently used batch
+                for vid_item in stats_resp["items"]:
+                    polled_views[vid_item["id"]] = int(vid_item["statistics"].get("viewCount", 0))
+            for vid in due_ids:
+                views = polled_views.get(vid)
+                changed = views is not None and last_views.get(vid) != views
+                if changed:
+                    stale_counts[vid] = 0
+                elif not forced:
+                    # A forced poll lands seconds after the last one; no movement there
+                    # says nothing about whether the video has stalled
+                    stale_counts[vid] = stale_counts.get(vid, 0) + 1
+                if views is None:
+                    continue
+                last_views[vid] = views
+                # Quiet-tier samples span at least QUIET_SAMPLE_MIN_SECS, however often
+                # the video is polled in between
+                anchor = vph_anchors.get(vid)
+                if anchor is None:
+                    vph_anchors[vid] = (wall_now, views)
+                elif wall_now - anchor[0] >= QUIET_SAMPLE_MIN_SECS:
+                    recent_vph[vid].append((views - anchor[1]) / ((wall_now - anchor[0]) / 3600))
+                    vph_anchors[vid] = (wall_now, views)
+            if any(resp is not None for resp in responses):
+                raw_q.put((now_ts, [resp for resp in responses if resp is not None]))
+
+            # Reschedule what we just polled, backing off as each video ages, stalls or goes
+            # quiet; a deadline that was overrun entirely is moved to now rather than fired twice
+            for due_at, vid in due:
+                age_secs = wall_now - video_to_published[vid].timestamp()
+                interval = max(
+                    poll_interval_secs(age_secs, stale_counts.get(vid, 0)),
+                    quiet_tier_interval(age_secs, recent_vph[vid]),
+                )
+                next_at = max(due_at + interval, now)
+                heapq.heappush(schedule, (next_at, vid))
+
+            # Wait until the next video is due; a stop or a wakeup ends the wait immediately
+            poll_wakeup.wait(timeout=max(0.0, schedule[0][0] - time.monotonic()))
+            if poll_stop.is_set():
                 return
+            forced = poll_wakeup.is_set()
+            if forced:
+                poll_wakeup.clear()
+                woke_at = time.monotonic()
+                schedule = [(woke_at, vid) for _, vid in schedule]
+                heapq.heapify(schedule)
+    finally:
+        raw_q.put(None)  # stop the consumer however this thread ends
+
+def consume_stats_responses(
+    raw_q: queue.Queue, shorts_data: dict, video_to_published: dict, ist_date_str: str
+):
+    """
+    Consumer thread for poll_stats_background: parse each poll's raw videos.list
+    responses, append the new rows per video and persist them. A None item stops it.
+    304 Not Modified batches never reach the queue.
+    """
+    while True:
+        item = raw_q.get()
+        if item is None:
+            return
+        now_ts, responses = item
 
+        persisted_rows = []
+        for stats_resp in responses:
             # Append new row to each video
             for vid_item in stats_resp["items"]:
                 vid = vid_item["id"]
                 stats = vid_item["statistics"]
-                row = (
+                views = int(stats.get("viewCount", 0))
+                likes = int(stats.get("likeCount", 0))
+                comments = int(stats.get("commentCount", 0))
+                entry = shorts_data[vid]
+                # Identical counters add no information; the next change's VPH
+                # spans the whole gap since the last stored row
+                if stats_unchanged(entry, views, likes, comments):
+                    continue
+                append_stats_row(
+                    entry,
                     now_ts,
-                    int(stats.get("viewCount", 0)),
-                    int(stats.get("likeCount", 0)),
-                    int(stats.get("commentCount", 0)),
+                    views,
+                    likes,
+                    comments,
+                    video_to_published[vid],
                 )
-                with data_lock:
-                    st.session_state.shorts_data[vid].append(row)
+                persisted_rows.append((vid, now_ts, views, likes, comments))
+
+        persist_stats_rows(persisted_rows, ist_date_str)
+
+@st.cache_data(max_entries=RENDER_CACHE_MAX_ENTRIES, show_spinner=False)
+def build_df(vid: str, n_rows: int, last_ts: np.datetime64, _cols: dict) -> "pd.DataFrame":
+    """
+    Wrap a video's stats columns (VPH and engagement already derived at append time)
+    in a DataFrame indexed by timestamp, ready to chart as-is, plus a 3-sample
+    rolling mean of VPH ("vph_smooth").
+    Cached on (vid, n_rows, last_ts): rows only ever grow by appending, so a rerun
+    without a new poll is a cache hit (_cols itself is left out of the cache key).
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {name: col for name, col in _cols.items() if name != "timestamp"},
+        index=pd.DatetimeIndex(_cols["timestamp"], name="timestamp"),
+    )
+    df["vph_smooth"] = df["vph"].rolling(window=3, min_periods=1).mean()
+    return df
+
+@st.cache_data(max_entries=RENDER_CACHE_MAX_ENTRIES, show_spinner=False)
+def build_charts(vid: str, n_rows: int, last_ts: np.datetime64, _chart_df: "pd.DataFrame") -> tuple:
+    """
+    Build the VPH and engagement-rate figures for a video's chart window. Each sets
+    a per-video uirevision so zoom/pan survive the 2-second reruns but reset when
+    another video is selected. Cached on the same
+    key as build_df, so a rerun without a new poll reuses both figures.
+    """
+    import plotly.graph_objects as go
+
+    vph_fig = go.Figure([
+        go.Scatter(x=_chart_df.index, y=_chart_df["vph"], mode="lines", name="vph"),
+        go.Scatter(x=_chart_df.index, y=_chart_df["vph_smooth"], mode="lines", name="vph_smooth"),
+    ])
+    vph_fig.update_layout(uirevision=f"vph:{vid}")
+
+    engagement_fig = go.Figure([
+        go.Scatter(x=_chart_df.index, y=_chart_df["engagement_rate"], mode="lines", name="engagement_rate"),
+    ])
+    engagement_fig.update_layout(uirevision=f"engagement_rate:{vid}", yaxis_tickformat=".2%")
+    return vph_fig, engagement_fig
+
+@st.fragment(run_every="2s")
+def render_metrics(vid_selected: str):
+    """
+    Live metrics, charts and raw table for one video. Runs as a fragment so the
+    2-second refresh reruns only this panel, not discovery logs and the selectbox.
+    """
+    # Checked here, not only on full reruns, since this panel refreshes on its own
+    with poll_status_lock:
+        error_message = st.session_state.poll_status["error_message"]
+        warning_message = st.session_state.poll_status["warning_message"]
+    if error_message:
+        st.error(f"{error_message} Polling has stopped; the data below is no longer updating.")
+    elif warning_message:
+        st.warning(warning_message)
+
+    # Build DataFrame for that video (snapshot the filled rows of its buffer)
+    n_rows, cols = stats_snapshot(st.session_state.shorts_data[vid_selected])
+    if not n_rows:
+        st.warning("No stats captured yet for this video. Please wait a moment.")
+        return
+
+    df = build_df(
+        vid_selected,
+        n_rows,
+        cols["timestamp"][-1],
+        cols,
+    )
 
-        # Sleep until next top of the hour
-        now = datetime.now(timezone.utc)
-        secs_until_next = 3600 - (now.minute * 60 + now.second)
-        time.sleep(secs_until_next)
+    # Show metrics
+    st.subheader(f"Metrics for: {st.session_state.video_to_channel[vid_selected]} → {vid_selected}")
+    latest = df.iloc[-1]
+    st.markdown(f"""
+    - **Timestamp (UTC):** {df.index[-1]}
+    - **Total Views:** {int(latest['viewCount'])}
+    - **Views Per Hour (VPH):** {latest['vph']:.2f}
+    - **Engagement Rate:** {latest['engagement_rate']:.2%}
+    """)
+    st.caption(f"API quota budget left today: {remaining_api_quota()} of {API_DAILY_UNIT_BUDGET} units")
+
+    # Charts
+    vph_fig, engagement_fig = build_charts(
+        vid_selected,
+        n_rows,
+        cols["timestamp"][-1],
+        df.tail(CHART_WINDOW_ROWS),
+    )
+    st.subheader("VPH Over Time")
+    st.plotly_chart(vph_fig, use_container_width=True)
+
+    st.subheader("Engagement Rate Over Time")
+    st.plotly_chart(engagement_fig, use_container_width=True)
+
+    # Raw data
+    st.subheader("Raw Data Table")
+    st.dataframe(df, use_container_width=True)
+
+@st.fragment
+def video_panel():
+    """
+    Video picker plus its live metrics panel. Runs as a fragment so switching videos
+    reruns only this block, not the discovery logs above it.
+    """
+    st.subheader("Available Shorts")
+    vids = st.session_state.video_ids
+    # Labels only change with the video list, so build them once, not on every rerun
+    if st.session_state.get("options_len") != len(vids):
+        st.session_state.options = [
+            f"{st.session_state.video_to_channel[v]} → {v}"
+            for v in vids
+        ]
+        st.session_state.options_len = len(vids)
+    sel = st.selectbox("Select a channel → video", st.session_state.options)
+    vid_selected = sel.split(" → ")[1]
+
+    render_metrics(vid_selected)
+
+@st.cache_resource(show_spinner=False)
+def poller_registry() -> dict:
+    """
+    Process-wide {"lock", "pollers": {ist_date_str: (poll_stop, poll_wakeup)}} of the
+    running pollers. Created once per process, and so is its atexit hook, which stops
+    and wakes every poller.
+    """
+    registry = {"lock": threading.Lock(), "pollers": {}}
+
+    def stop_all_pollers() -> None:
+        with registry["lock"]:
+            for poll_stop, poll_wakeup in registry["pollers"].values():
+                poll_stop.set()
+                poll_wakeup.set()
+
+    atexit.register(stop_all_pollers)
+    return registry
+
+@st.cache_resource(max_entries=POLLED_DAYS, show_spinner=False)
+def day_tracker(ist_date_str: str) -> dict:
+    """
+    Shared state for one IST day, one per process however many sessions view it:
+    the day's discovery plus its history from disk, the stats buffers, and the single
+    poller thread that fills them. Starting a day's poller stops any older than the
+    newest POLLED_DAYS. Raise DiscoveryError (not cached, so the next session retries).
+    """
+    (
+        shorts_data,
+        video_to_channel,
+        video_to_published,
+        logs,
+        no_shorts_flag,
+    ) = discover_and_initial_stats(ist_date_str)
+    # Pick up history already on disk (before a restart, or another process)
+    shorts_data.update(load_persisted_stats(shorts_data, video_to_published, ist_date_str))
+    tracker = {
+        "shorts_data": shorts_data,
+        "video_ids": tuple(shorts_data),  # frozen after discovery
+        "video_to_channel": video_to_channel,
+        "video_to_published": video_to_published,
+        "discovery_logs": logs,
+        "no_shorts_flag": no_shorts_flag,
+        # Written by the poller thread, under poll_status_lock
+        "poll_status": {"error_message": None, "warning_message": None},
+        "poll_wakeup": threading.Event(),  # set to poll every video now
+        "poll_stop": threading.Event(),  # set (then poll_wakeup) to end the poller
+        "poll_now_at": float("-inf"),  # monotonic time of the last "Poll now" wake-up
+    }
+    if no_shorts_flag:
+        return tracker
+
+    registry = poller_registry()
+    with registry["lock"]:
+        registry["pollers"][ist_date_str] = (tracker["poll_stop"], tracker["poll_wakeup"])
+        for old_day in sorted(registry["pollers"])[:-POLLED_DAYS]:
+            poll_stop, poll_wakeup = registry["pollers"].pop(old_day)
+            poll_stop.set()
+            poll_wakeup.set()
+
+    # Everything the poller needs is in place now, so start it right away
+    threading.Thread(
+        target=poll_stats_background,
+        args=(
+            tracker["shorts_data"],
+            tracker["video_ids"],
+            tracker["video_to_published"],
+            tracker["poll_status"],
+            tracker["poll_wakeup"],
+            tracker["poll_stop"],
+            ist_date_str,
+        ),
+        daemon=True,
+    ).start()
+    return tracker
 
 # ----------------------- Main App Logic ----------------------------
 
-# 1) Run discovery + initial stats via cached function
-shorts_data_cache, video_to_channel_cache, video_to_published_cache, logs_cache, no_shorts_flag_cache = discover_and_initial_stats()
+st.title("📊 YouTube Shorts VPH & Engagement Tracker")
 
-# Store into session_state so UI and background thread can see them
+# 1) Once per session: attach to the process-wide tracker (discovery, stats, poller)
+#    of the session's IST day, and store its parts into session_state for the UI.
+#    Later reruns (even past IST midnight) reuse that day. A failed discovery is not
+#    cached, so reloading the page retries it.
 if "initialized" not in st.session_state:
-    st.session_state.initialized = True
-    st.session_state.shorts_data = shorts_data_cache
-    st.session_state.video_to_channel = video_to_channel_cache
-    st.session_state.video_to_published = video_to_published_cache
-    st.session_state.discovery_logs = logs_cache
-    st.session_state.error_message = None
-    st.session_state.no_shorts_flag = no_shorts_flag_cache
+    ist_date_str = get_today_ist_date_str()
+    try:
+        tracker = day_tracker(ist_date_str)
+    except DiscoveryError as e:
+        st.subheader("Discovery Progress")
+        st.text("\n".join(e.logs))
+        st.error("Discovery failed. Reload the page to retry.")
+        st.stop()
 
-    # Immediately show logs, then start the polling thread
-    threading.Thread(target=poll_stats_background, daemon=True).start()
+    st.session_state.initialized = True
+    st.session_state.ist_date_str = ist_date_str
+    st.session_state.tracker = tracker
+    st.session_state.shorts_data = tracker["shorts_data"]
+    st.session_state.video_ids = tracker["video_ids"]
+    st.session_state.video_to_channel = tracker["video_to_channel"]
+    st.session_state.video_to_published = tracker["video_to_published"]
+    st.session_state.discovery_logs = tracker["discovery_logs"]
+    st.session_state.poll_status = tracker["poll_status"]
+    st.session_state.no_shorts_flag = tracker["no_shorts_flag"]
 
 # 2) UI Rendering
 
-st.title("📊 YouTube Shorts VPH & Engagement Tracker")
-
 # Show discovery logs
 st.subheader("Discovery Progress")
-for log in st.session_state.discovery_logs:
-    st.write(log)
+st.text("\n".join(st.session_state.discovery_logs))  # one element, not one per line
 
 # Show error or no-shorts, if any
 if st.session_state.no_shorts_flag:
     st.info("No Shorts (≤ 3 minutes) were uploaded today in IST for the selected channels.")
     st.stop()
 
-if st.session_state.error_message:
-    st.error(st.session_state.error_message)
+with poll_status_lock:
+    error_message = st.session_state.poll_status["error_message"]
+if error_message:
+    st.error(error_message)
     st.stop()
 
 # At this point, we have at least one video and initial stats
@@ -288,55 +1264,20 @@ if not st.session_state.shorts_data:
     st.info("Waiting for initial stats fetch to complete...")
     st.stop()
 
-# Let user pick a video
-st.subheader("Available Shorts")
-vids = list(st.session_state.shorts_data.keys())
-options = [
-    f"{st.session_state.video_to_channel[v]} → {v}"
-    for v in vids
-]
-sel = st.selectbox("Select a channel → video", options)
-vid_selected = sel.split(" → ")[1]
+# Wake the day's shared poller rather than waiting for the next video to fall due
+# (at most once per POLL_NOW_COOLDOWN_SECS across all sessions, since every click
+# polls every video)
+if st.button("Poll now"):
+    tracker = st.session_state.tracker
+    with poll_status_lock:
+        since_last = time.monotonic() - tracker["poll_now_at"]
+        if since_last >= POLL_NOW_COOLDOWN_SECS:
+            tracker["poll_now_at"] = time.monotonic()
+    if since_last < POLL_NOW_COOLDOWN_SECS:
+        retry_in = int(POLL_NOW_COOLDOWN_SECS - since_last) + 1
+        st.caption(f"Polled {int(since_last)} s ago; try again in {retry_in} s.")
+    else:
+        tracker["poll_wakeup"].set()
 
-# Build DataFrame for that video
-rows = st.session_state.shorts_data[vid_selected]
-if not rows:
-    st.warning("No stats captured yet for this video. Please wait a moment.")
-    st.stop()
-
-df = pd.DataFrame(rows, columns=["timestamp", "viewCount", "likeCount", "commentCount"])
-df["timestamp"] = pd.to_datetime(df["timestamp"])
-
-# Compute VPH:
-# - First row: total_views ÷ hours_since_published
-# - Subsequent rows: diff in viewCount
-published = st.session_state.video_to_published[vid_selected]
-first_ts = df["timestamp"].iloc[0]
-hours_since_pub = max((first_ts - published).total_seconds() / 3600, 1e-6)
-first_vph = df["viewCount"].iloc[0] / hours_since_pub
-vph_vals = [first_vph] + df["viewCount"].diff().iloc[1:].tolist()
-df["vph"] = vph_vals
-
-# Compute engagement rate = (likes + comments) / views
-df["engagement_rate"] = (df["likeCount"] + df["commentCount"]) / df["viewCount"]
-
-# Show metrics
-st.subheader(f"Metrics for: {st.session_state.video_to_channel[vid_selected]} → {vid_selected}")
-latest = df.iloc[-1]
-st.markdown(f"""
-- **Timestamp (UTC):** {latest['timestamp']}
-- **Total Views:** {int(latest['viewCount'])}
-- **Views Per Hour (VPH):** {latest['vph']:.2f}
-- **Engagement Rate:** {latest['engagement_rate']:.2%}
-""")
-
-# Charts
-st.subheader("VPH Over Time")
-st.line_chart(df.set_index("timestamp")["vph"])
-
-st.subheader("Engagement Rate Over Time")
-st.line_chart(df.set_index("timestamp")["engagement_rate"])
-
-# Raw data
-st.subheader("Raw Data Table")
-st.dataframe(df, use_container_width=True)
+# Let user pick a video
+video_panel()